@@ -1,42 +1,77 @@
 import os
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Remove seções [profile.*] e todo o conteúdo até a próxima seção ou fim do arquivo
+# Padrão: [profile.xxx] seguido por qualquer coisa até a próxima [ ou fim
+# \r? mantém o suporte a quebras de linha CRLF (checkout no Windows)
+PROFILE_PATTERN = re.compile(rb'\r?\n\[profile\.[^\]]+\][^\[]*')
+
+# Linhas vazias extras, também com quebras de linha CRLF
+BLANK_LINES_PATTERN = re.compile(rb'(\r?\n)(?:\r?\n){2,}')
+
+def has_removable_content(content):
+    """Pré-checagem barata: nunca descarta um arquivo que as regex acima alterariam"""
+    # '[profile.' é um superconjunto de PROFILE_PATTERN; as linhas vazias usam o próprio padrão
+    return b'[profile.' in content or BLANK_LINES_PATTERN.search(content) is not None
+
 def remove_profile_sections(file_path):
     """Remove todas as seções [profile.*] de um arquivo Cargo.toml"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    file_path = Path(file_path)
+    # Lê em bytes: o conteúdo nunca passa pela decodificação UTF-8
+    content = file_path.read_bytes()
 
-    original_content = content
+    # A maioria dos Cargo.toml não tem nada a remover: evita passar pelas regex
+    if not has_removable_content(content):
+        return False
 
-    # Remove seções [profile.*] e todo o conteúdo até a próxima seção ou fim do arquivo
-    # Padrão: [profile.xxx] seguido por qualquer coisa até a próxima [ ou fim
-    pattern = r'\n\[profile\.[^\]]+\][^\[]*'
-    content = re.sub(pattern, '', content)
+    original_content = content
 
-    # Remove linhas vazias extras
-    content = re.sub(r'\n\n\n+', '\n\n', content)
+    content = PROFILE_PATTERN.sub(b'', content)
+    content = BLANK_LINES_PATTERN.sub(rb'\1\1', content)
 
     if content != original_content:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content.rstrip() + '\n')
+        newline = b'\r\n' if b'\r\n' in original_content else b'\n'
+        file_path.write_bytes(content.rstrip() + newline)
         return True
     return False
 
 def main():
     base_dirs = ['avila', 'avl', 'avx']
+    cargo_tomls = [
+        cargo_toml
+        for base_dir in base_dirs
+        if os.path.exists(base_dir)
+        for cargo_toml in Path(base_dir).rglob('Cargo.toml')
+    ]
     updated_files = []
+    failed_files = []
 
-    for base_dir in base_dirs:
-        if not os.path.exists(base_dir):
-            continue
-
-        for cargo_toml in Path(base_dir).rglob('Cargo.toml'):
-            if remove_profile_sections(cargo_toml):
+    # Leitura/escrita dos arquivos é I/O-bound: threads sobrepõem a latência de disco
+    with ThreadPoolExecutor() as executor:
+        futures = [
+            executor.submit(remove_profile_sections, cargo_toml)
+            for cargo_toml in cargo_tomls
+        ]
+        # Coleta cada arquivo individualmente: uma falha não esconde os que já foram alterados
+        for cargo_toml, future in zip(cargo_tomls, futures):
+            try:
+                updated = future.result()
+            except Exception as e:
+                failed_files.append(str(cargo_toml))
+                print(f"✗ Failed: {cargo_toml}: {e}")
+                continue
+            if updated:
                 updated_files.append(str(cargo_toml))
                 print(f"✓ Updated: {cargo_toml}")
 
     print(f"\n✅ Total files updated: {len(updated_files)}")
 
+    if failed_files:
+        print(f"❌ Total files failed: {len(failed_files)}")
+        sys.exit(1)
+
 if __name__ == '__main__':
     main()